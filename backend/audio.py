@@ -7,63 +7,47 @@ import os
 import pyaudio
 import wave
 
+from events import bus
 from speechtokey import speech_to_keyboard
 
 # Speech detection and wake word globals
-speech_queue = queue.Queue()
 is_listening = False
 listening_active = False
 speech_recognition_thread = None
 wake_word = "hey adam"
 listening_timeout = 3  # seconds
+feedback_player = None
+FEEDBACK_SAMPLE_RATE = 44100  # Hz
+
+
+def set_listening(active):
+    """Update the listening flags and notify subscribers of the state change"""
+    global is_listening, listening_active
+    is_listening = active
+    listening_active = active
+    bus.publish("listening", active=active)
+
 
 class WakeWordDetector:
-    def __init__(self, wake_word="hey adam", sensitivity=0.5):
+    def __init__(self, wake_word="hey adam", sensitivity=0.5, feedback_player=None):
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 4000  # Adjust this based on your environment
         self.recognizer.dynamic_energy_threshold = True
         self.wake_word = wake_word.lower()
         self.sensitivity = sensitivity
         
-        # Sound for feedback
-        if os.path.exists("listening_start.wav"):
-            self.start_sound = True
-        else:
-            self.start_sound = False
-            
-        if os.path.exists("listening_stop.wav"):
-            self.stop_sound = True
-        else:
-            self.stop_sound = False
+        # Sounds for feedback, cached in memory and played on a shared stream
+        self.feedback_player = feedback_player
+        self.start_sound_done = None
     
     def play_feedback_sound(self, is_start_sound):
-        """Play audio feedback using simple wave playback"""
-        if (is_start_sound and self.start_sound) or (not is_start_sound and self.stop_sound):
-            try:
-                filename = "listening_start.wav" if is_start_sound else "listening_stop.wav"
-                wf = wave.open(filename, 'rb')
-                p = pyaudio.PyAudio()
-                
-                stream = p.open(format=p.get_format_from_width(wf.getsampwidth()),
-                                channels=wf.getnchannels(),
-                                rate=wf.getframerate(),
-                                output=True)
-                
-                data = wf.readframes(1024)
-                while len(data) > 0:
-                    stream.write(data)
-                    data = wf.readframes(1024)
-                
-                stream.stop_stream()
-                stream.close()
-                p.terminate()
-            except Exception as e:
-                print(f"Error playing feedback sound: {e}")
+        """Queue audio feedback on the shared output stream, returns an Event set when it has played"""
+        if self.feedback_player is not None:
+            return self.feedback_player.play("start" if is_start_sound else "stop")
+        return None
     
     def listen_for_wake_word(self):
         """Continuously listen for the wake word"""
-        global is_listening, listening_active
-        
         print("Listening for wake word...")
         with sr.Microphone() as source:
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
@@ -81,9 +65,8 @@ class WakeWordDetector:
                         
                         if self.wake_word in text:
                             print("Wake word detected! Starting to listen...")
-                            self.play_feedback_sound(True)  # Play start sound
-                            is_listening = True
-                            listening_active = True
+                            self.start_sound_done = self.play_feedback_sound(True)  # Play start sound
+                            set_listening(True)
                             # Start the speech recognition in a separate thread
                             speech_thread = threading.Thread(target=self.listen_for_speech)
                             speech_thread.daemon = True
@@ -97,9 +80,10 @@ class WakeWordDetector:
                     
     def listen_for_speech(self):
         """Listen for speech after wake word is detected and convert to keyboard input"""
-        global is_listening, listening_active, speech_queue
-        
         with sr.Microphone() as source:
+            # Let the start chime finish (~0.3s) so it is not measured as ambient noise
+            if self.start_sound_done is not None:
+                self.start_sound_done.wait(timeout=1)
             self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
             
             last_speech_time = time.time()
@@ -113,8 +97,8 @@ class WakeWordDetector:
                         text = self.recognizer.recognize_google(audio)  # Keep original case for typing
                         print(f"Converting to keyboard input: {text}")
                         
-                        # Add to speech queue for display
-                        speech_queue.put(text)
+                        # Push to subscribers for display
+                        bus.publish("speech", text=text)
                         last_speech_time = time.time()
                         
                         # Convert to keyboard input
@@ -125,8 +109,7 @@ class WakeWordDetector:
                         if time.time() - last_speech_time > listening_timeout:
                             print("Silence timeout, stopping listening.")
                             self.play_feedback_sound(False)  # Play stop sound
-                            is_listening = False
-                            listening_active = False
+                            set_listening(False)
                             break
                     except sr.RequestError as e:
                         print(f"Could not request results; {e}")
@@ -136,81 +119,105 @@ class WakeWordDetector:
                     if time.time() - last_speech_time > listening_timeout:
                         print("Silence timeout, stopping listening.")
                         self.play_feedback_sound(False)  # Play stop sound
-                        is_listening = False
-                        listening_active = False
+                        set_listening(False)
                         break
     
     def stop_listening(self):
         """Force stop listening"""
-        global is_listening, listening_active
-        is_listening = False
-        listening_active = False
+        set_listening(False)
         self.play_feedback_sound(False)  # Play stop sound
 
 
+def generate_tone(start_freq, end_freq, duration=0.3, volume=0.5, fs=FEEDBACK_SAMPLE_RATE):
+    """Generate a 16-bit mono frequency sweep from start_freq to end_freq"""
+    i = np.arange(int(fs * duration))
+    f = start_freq + (end_freq - start_freq) * i / (fs * duration)
+    samples = volume * np.sin(2 * np.pi * f * i / fs)
+    return (samples * 32767).astype(np.int16)
+
+
+def load_feedback_sound(filename, fallback):
+    """Read a WAV file into memory if it matches the output stream format, else use fallback samples"""
+    if os.path.exists(filename):
+        try:
+            with wave.open(filename, 'rb') as wf:
+                if (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) == (1, 2, FEEDBACK_SAMPLE_RATE):
+                    return wf.readframes(wf.getnframes())
+                print(f"Feedback sound {filename} has an unsupported format, using generated tone")
+        except Exception as e:
+            print(f"Error loading feedback sound {filename}: {e}")
+    return fallback.tobytes()
+
+
 def create_speech_feedback_sounds():
-    """Create audio feedback sounds for listening start/stop"""
-    
-    # Check if sound files already exist
-    if os.path.exists("listening_start.wav") and os.path.exists("listening_stop.wav"):
-        return
-    
-    # Create listening start sound - rising tone
-    p = pyaudio.PyAudio()
-    
-    # Start sound (rising tone)
-    duration = 0.3  # seconds
-    volume = 0.5     # range [0.0, 1.0]
-    fs = 44100       # sampling rate, Hz
-    
-    samples = []
-    for i in range(int(fs * duration)):
-        # Rising frequency from 440 to 880 Hz
-        f = 440 + (880 - 440) * i / (fs * duration)
-        sample = volume * np.sin(2 * np.pi * f * i / fs)
-        samples.append(sample)
-    
-    samples = np.array(samples)
-    samples = (samples * 32767).astype(np.int16)
-    
-    with wave.open("listening_start.wav", 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(p.get_sample_size(pyaudio.paInt16))
-        wf.setframerate(fs)
-        wf.writeframes(samples.tobytes())
-    
-    # Stop sound (falling tone)
-    samples = []
-    for i in range(int(fs * duration)):
-        # Falling frequency from 880 to 440 Hz
-        f = 880 - (880 - 440) * i / (fs * duration)
-        sample = volume * np.sin(2 * np.pi * f * i / fs)
-        samples.append(sample)
-    
-    samples = np.array(samples)
-    samples = (samples * 32767).astype(np.int16)
-    
-    with wave.open("listening_stop.wav", 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(p.get_sample_size(pyaudio.paInt16))
-        wf.setframerate(fs)
-        wf.writeframes(samples.tobytes())
-    
-    p.terminate()
+    """Create audio feedback sounds for listening start/stop, returned as raw PCM bytes"""
+    # Start sound (rising tone), stop sound (falling tone)
+    return {
+        "start": load_feedback_sound("listening_start.wav", generate_tone(440, 880)),
+        "stop": load_feedback_sound("listening_stop.wav", generate_tone(880, 440)),
+    }
+
+
+class FeedbackPlayer:
+    """
+    Plays cached feedback sounds through one long-lived PyAudio output stream.
+    Sounds are queued and written by a background thread so callers never wait
+    for device setup or playback.
+    """
+    def __init__(self, sounds):
+        self.sounds = sounds
+        self.pending = queue.Queue()
+        self.pyaudio = pyaudio.PyAudio()
+        self.stream = self.pyaudio.open(format=pyaudio.paInt16,
+                                        channels=1,
+                                        rate=FEEDBACK_SAMPLE_RATE,
+                                        output=True)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def play(self, name):
+        """Queue a sound, returns an Event that is set once it has been written to the device"""
+        done = threading.Event()
+        if name in self.sounds:
+            self.pending.put((self.sounds[name], done))
+        else:
+            done.set()
+        return done
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            data, done = item
+            try:
+                self.stream.write(data)
+            except Exception as e:
+                print(f"Error playing feedback sound: {e}")
+            finally:
+                done.set()
+
+    def close(self):
+        self.pending.put(None)
+        self.thread.join(timeout=1)
+        self.stream.stop_stream()
+        self.stream.close()
+        self.pyaudio.terminate()
 
 
 def start_speech_recognition():
     """Initialize and start speech recognition in a separate thread"""
     global speech_recognition_thread
     
-    # Create sound files for feedback
+    # Create feedback sounds and open the output stream once
+    global feedback_player
     try:
-        create_speech_feedback_sounds()
+        feedback_player = FeedbackPlayer(create_speech_feedback_sounds())
     except Exception as e:
         print(f"Could not create feedback sounds: {e}")
     
     # Initialize wake word detector
-    detector = WakeWordDetector(wake_word=wake_word)
+    detector = WakeWordDetector(wake_word=wake_word, feedback_player=feedback_player)
     
     # Start wake word detection in a background thread
     speech_recognition_thread = threading.Thread(target=detector.listen_for_wake_word)
@@ -220,16 +227,9 @@ def start_speech_recognition():
     print("Speech recognition initialized with wake word:", wake_word)
 
 
-def get_recognized_speech():
-    """Get any text recognized since last call, non-blocking"""
-    global speech_queue
-    
-    collected_text = []
-    while not speech_queue.empty():
-        try:
-            text = speech_queue.get_nowait()
-            collected_text.append(text)
-        except queue.Empty:
-            break
-    
-    return " ".join(collected_text) if collected_text else None
\ No newline at end of file
+def stop_speech_recognition():
+    """Release the feedback output stream, called on server shutdown"""
+    global feedback_player
+    if feedback_player is not None:
+        feedback_player.close()
+        feedback_player = None
@@ -0,0 +1,139 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from classifier import load_classifier
+from gestures import HANDS_OPTIONS, HISTORY_LENGTH, add_confirmed, confirm_gesture, hand_record
+
+# -----------------------
+# Offline Gesture Analysis
+# -----------------------
+# A recording is split into contiguous frame ranges, each analysed by a worker
+# process with its own MediaPipe Hands graph. Every worker starts
+# overlap_frames before its range so hand tracking and gesture smoothing are
+# warmed up; those frames are dropped when the chunks are merged.
+
+DEFAULT_OVERLAP_FRAMES = 15
+MIN_CHUNK_FRAMES = 60
+
+
+def get_video_info(path):
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        return fps, frame_count
+    finally:
+        cap.release()
+
+
+def analyze_chunk(path, start, end, overlap_frames=DEFAULT_OVERLAP_FRAMES, fps=30.0, mirror=True):
+    """Analyse frames [start, end) of a video and return one record per frame"""
+    import mediapipe as mp
+
+    hands = mp.solutions.hands.Hands(**HANDS_OPTIONS)
+    classifier = load_classifier()
+    histories = {"Left": deque(maxlen=HISTORY_LENGTH), "Right": deque(maxlen=HISTORY_LENGTH)}
+    warmup_start = max(0, start - overlap_frames)
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, warmup_start)
+    timeline = []
+    try:
+        for index in range(warmup_start, end):
+            success, frame = cap.read()
+            if not success:
+                break
+            # Live frames are mirrored before inference, keep handedness consistent with them
+            if mirror:
+                frame = cv2.flip(frame, 1)
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+            detected = []
+            if results.multi_hand_landmarks and results.multi_handedness:
+                labels = [handedness.classification[0].label for handedness in results.multi_handedness]
+                gestures = classifier.classify(results.multi_hand_landmarks, labels, frame)
+                for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                    classification = results.multi_handedness[i].classification[0]
+                    gesture = gestures[i]
+                    if classification.label in histories:
+                        histories[classification.label].append(gesture)
+                    detected.append(hand_record(hand_landmarks, classification, gesture))
+            add_confirmed(detected, {hand: confirm_gesture(history) for hand, history in histories.items()})
+
+            if index >= start:
+                timeline.append({"frame": index, "time": round(index / fps, 4), "hands": detected})
+    finally:
+        cap.release()
+        hands.close()
+    return timeline
+
+
+def analyze_video(path, workers=None, overlap_frames=DEFAULT_OVERLAP_FRAMES, mirror=True):
+    """Return a per-frame gesture timeline for a video file, processed in parallel chunks"""
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    if overlap_frames < 0:
+        raise ValueError("overlap must not be negative")
+    fps, frame_count = get_video_info(path)
+    workers = workers or os.cpu_count() or 1
+    if frame_count <= 0:
+        # Container does not report a length, fall back to a single sequential pass
+        frame_count, workers = 2 ** 31 - 1, 1
+    chunk_size = max(MIN_CHUNK_FRAMES, math.ceil(frame_count / workers))
+    ranges = [(start, min(start + chunk_size, frame_count)) for start in range(0, frame_count, chunk_size)]
+
+    if len(ranges) == 1:
+        timeline = analyze_chunk(path, 0, ranges[0][1], overlap_frames, fps, mirror)
+    else:
+        # Spawn rather than fork, the server process already runs threads and a MediaPipe graph.
+        # Spawned workers re-import the parent's __main__ (main.py when the server is started
+        # with `python main.py`), so main.py must stay cheap to import and keep its
+        # server start behind the __name__ guard.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=context) as executor:
+            futures = [executor.submit(analyze_chunk, path, start, end, overlap_frames, fps, mirror)
+                       for start, end in ranges]
+            timeline = [record for future in futures for record in future.result()]
+
+    return {"fps": fps, "frame_count": len(timeline), "frames": timeline}
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("must not be negative")
+    return number
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Label hand gestures in a recorded video")
+    parser.add_argument("video", help="Path to the video file")
+    parser.add_argument("-o", "--output", help="Write the timeline JSON here instead of stdout")
+    parser.add_argument("-w", "--workers", type=positive_int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--overlap", type=non_negative_int, default=DEFAULT_OVERLAP_FRAMES,
+                        help="Warm-up frames processed before each chunk")
+    parser.add_argument("--no-mirror", action="store_true", help="Do not mirror frames before inference")
+    args = parser.parse_args()
+
+    result = analyze_video(args.video, args.workers, args.overlap, not args.no_mirror)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+        print(f"Wrote {result['frame_count']} frames to {args.output}")
+    else:
+        print(json.dumps(result))
@@ -0,0 +1,219 @@
+import os
+import threading
+
+import numpy as np
+
+from gestures import detect_static_gesture
+
+# -----------------------
+# Pluggable Gesture Classifiers
+# -----------------------
+# "rules"    - hand-tuned thresholds in gestures.detect_static_gesture
+# "centroid" - nearest-centroid model over normalized landmark features,
+#              trained per user with the Calibrator; hands it cannot place
+#              confidently fall back to the rules
+#
+# GESTURE_CLASSIFIER selects the backend; by default the centroid model is
+# used whenever a calibrated model file exists.
+
+MODEL_PATH = os.environ.get("GESTURE_MODEL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "gesture_model.npz"))
+CLASSIFIER_BACKEND = os.environ.get("GESTURE_CLASSIFIER", "auto")
+
+WRIST, MIDDLE_MCP = 0, 9
+MIN_THRESHOLD = 0.15
+# Minimum cosine between a hand's direction and its class's calibrated direction,
+# a hand turned further than 90 degrees away is left to the rules
+MIN_ALIGNMENT = 0.0
+
+
+def landmarks_to_array(hand_landmarks_list):
+    """Stack MediaPipe landmark lists into an (n_hands, 21, 3) array"""
+    return np.array([[(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+                     for hand_landmarks in hand_landmarks_list], dtype=np.float64).reshape(-1, 21, 3)
+
+
+def landmark_features(points, handedness, aspect=1.0):
+    """
+    Rotation- and scale-invariant features for a batch of hands.
+
+    Landmarks are moved to the wrist, rotated so the wrist -> middle knuckle
+    axis points up, and divided by its length. Left hands are mirrored so one
+    model serves both. Returns (features, orientations): an (n_hands, 40)
+    array and the (n_hands, 2) unit on-screen hand direction, which is kept
+    apart so it only separates poses that differ by orientation alone.
+    """
+    xy = points[:, :, :2].copy()
+    xy[:, :, 0] *= aspect  # normalized x and y have different pixel scales
+    left = np.array([label == "Left" for label in handedness], dtype=bool)
+    xy[left, :, 0] *= -1
+    xy -= xy[:, WRIST:WRIST + 1]
+
+    axis = xy[:, MIDDLE_MCP]
+    scale = np.linalg.norm(axis, axis=1)
+    scale[scale == 0] = 1.0
+    ux, uy = axis[:, 0] / scale, axis[:, 1] / scale
+    # Rotation taking (ux, uy) to (0, -1), i.e. straight up in image coordinates
+    rotation = np.stack([np.stack([-uy, ux], axis=1), np.stack([-ux, -uy], axis=1)], axis=1)
+    normalized = np.einsum('nij,nkj->nki', rotation, xy) / scale[:, None, None]
+
+    return normalized[:, 1:].reshape(len(points), -1), np.stack([ux, uy], axis=1)
+
+
+class RuleClassifier:
+    name = "rules"
+    labels = ["Open Palm", "Peace", "Rock On", "Thumbs Up", "Thumbs Down", "Point"]
+
+    def classify(self, hand_landmarks_list, handedness, frame):
+        return [detect_static_gesture(hand_landmarks, frame) for hand_landmarks in hand_landmarks_list]
+
+
+class CentroidClassifier:
+    name = "centroid"
+
+    def __init__(self, labels, centroids, thresholds, orientations, fallback=None):
+        self.labels = list(labels)
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+        self.orientations = np.asarray(orientations, dtype=np.float64)
+        self.centroid_norms = (self.centroids ** 2).sum(axis=1)
+        self.fallback = fallback or RuleClassifier()
+
+    def predict(self, features, orientations):
+        """
+        Nearest centroid for every row at once; rows no class accepts get None.
+
+        Distances are on the rotation-invariant shape only, so a tilted hand
+        still matches. A class additionally requires the hand to point within
+        MIN_ALIGNMENT of the direction it was calibrated in: thumbs up and thumbs
+        down have the same normalized shape and differ by orientation alone.
+        """
+        distances = (features ** 2).sum(axis=1)[:, None] - 2 * features @ self.centroids.T + self.centroid_norms[None, :]
+        distances = np.sqrt(np.maximum(distances, 0))
+        alignment = orientations @ self.orientations.T
+        accepted = (distances <= self.thresholds[None, :]) & (alignment > MIN_ALIGNMENT)
+        best = np.where(accepted, distances, np.inf).argmin(axis=1)
+        return [self.labels[label] if accepted[row, label] else None for row, label in enumerate(best)]
+
+    def classify(self, hand_landmarks_list, handedness, frame):
+        if not hand_landmarks_list:
+            return []
+        h, w, _ = frame.shape
+        features, orientations = landmark_features(landmarks_to_array(hand_landmarks_list), handedness, w / h)
+        predictions = self.predict(features, orientations)
+        rejected = [i for i, label in enumerate(predictions) if label is None]
+        if rejected:
+            fallback = self.fallback.classify([hand_landmarks_list[i] for i in rejected],
+                                              [handedness[i] for i in rejected], frame)
+            for i, label in zip(rejected, fallback):
+                predictions[i] = label
+        return predictions
+
+    @classmethod
+    def fit(cls, samples, orientations):
+        """Train from {label: (n_samples, n_features) array} and {label: (n_samples, 2) array}"""
+        labels = sorted(samples)
+        centroids, thresholds, directions = [], [], []
+        for label in labels:
+            data = np.asarray(samples[label])
+            centroid = data.mean(axis=0)
+            spread = np.linalg.norm(data - centroid, axis=1)
+            centroids.append(centroid)
+            thresholds.append(max(spread.mean() + 3 * spread.std(), MIN_THRESHOLD))
+            direction = np.asarray(orientations[label]).mean(axis=0)
+            directions.append(direction / max(np.linalg.norm(direction), 1e-9))
+        return cls(labels, centroids, thresholds, directions)
+
+    def merge(self, other):
+        """Model with the classes of both, those calibrated again in `other` replacing ours"""
+        keep = [i for i, label in enumerate(self.labels) if label not in other.labels]
+        return CentroidClassifier([self.labels[i] for i in keep] + other.labels,
+                                  np.concatenate([self.centroids[keep], other.centroids]),
+                                  np.concatenate([self.thresholds[keep], other.thresholds]),
+                                  np.concatenate([self.orientations[keep], other.orientations]))
+
+    def save(self, path=MODEL_PATH):
+        np.savez(path, labels=np.array(self.labels), centroids=self.centroids,
+                 thresholds=self.thresholds, orientations=self.orientations)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with np.load(path) as data:
+            if "orientations" not in data:
+                raise ValueError("model predates orientation-free features, recalibrate")
+            return cls(data["labels"].tolist(), data["centroids"], data["thresholds"], data["orientations"])
+
+
+def load_classifier(backend=CLASSIFIER_BACKEND, path=MODEL_PATH):
+    """Build the configured classifier, falling back to the rules when no model is available"""
+    if backend in ("auto", "centroid") and os.path.exists(path):
+        try:
+            return CentroidClassifier.load(path)
+        except Exception as e:
+            print(f"Could not load gesture model {path}: {e}")
+    elif backend == "centroid":
+        print(f"No gesture model at {path}, using rule-based classifier")
+    return RuleClassifier()
+
+
+class Calibrator:
+    """
+    Collects feature samples of one gesture at a time for a user's centroid model.
+    Samples are added from the capture thread while requests start and reset
+    calibration, so every method holds the lock.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.orientations = {}
+        self.label = None
+        self.hand = "Right"
+        self.remaining = 0
+
+    @property
+    def active(self):
+        return self.label is not None and self.remaining > 0
+
+    def start(self, label, count=30, hand="Right"):
+        with self.lock:
+            self.samples.setdefault(label, [])
+            self.orientations.setdefault(label, [])
+            self.label = label
+            self.hand = hand
+            self.remaining = count
+
+    def add(self, features, orientation):
+        with self.lock:
+            if not self.active:
+                return
+            self.samples[self.label].append(np.array(features))
+            self.orientations[self.label].append(np.array(orientation))
+            self.remaining -= 1
+            if self.remaining == 0:
+                print(f"Calibration captured {len(self.samples[self.label])} samples of {self.label}")
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+            self.orientations = {}
+            self.label = None
+            self.remaining = 0
+
+    def status(self):
+        with self.lock:
+            return {
+                "active": self.active,
+                "gesture": self.label,
+                "hand": self.hand,
+                "remaining": self.remaining,
+                "samples": {label: len(rows) for label, rows in self.samples.items()},
+            }
+
+    def fit(self, base=None):
+        """Train on the captured gestures, keeping the other classes of a previously saved `base` model"""
+        with self.lock:
+            samples = {label: np.stack(rows) for label, rows in self.samples.items() if rows}
+            orientations = {label: np.stack(self.orientations[label]) for label in samples}
+        if not samples:
+            raise ValueError("No calibration samples captured")
+        model = CentroidClassifier.fit(samples, orientations)
+        return base.merge(model) if base is not None else model
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import threading
+import time
+
+# -----------------------
+# In-process event bus
+# -----------------------
+# Producers (speech thread, frame loop) publish from any thread; consumers are
+# asyncio queues owned by the SSE/WebSocket handlers, fed through their loop.
+#
+# Event types:
+#   speech     {"text": str}
+#   listening  {"active": bool}
+#   gesture    {"hand": "Left" | "Right", "gesture": str | None}
+#   dynamic    {"hand": "Left" | "Right", "gesture": str}
+#   scroll     {"active": bool}
+#   action     {"action": str}
+
+# Events describing current state, replayed to new consumers; the rest are one-off occurrences
+STATE_EVENTS = {"listening", "gesture", "scroll"}
+
+class EventBus:
+    def __init__(self, max_pending=100):
+        self.max_pending = max_pending
+        self.subscribers = set()
+        self.latest = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self):
+        """Register a consumer on the running event loop, returns its asyncio.Queue"""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.max_pending))
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def snapshot(self):
+        """Most recent event of each state type, so new consumers start with the current state"""
+        with self.lock:
+            return list(self.latest.values())
+
+    def publish(self, event_type, **data):
+        event = {"type": event_type, "time": time.time(), **data}
+        with self.lock:
+            if event_type in STATE_EVENTS:
+                self.latest[(event_type, data.get("hand"))] = event
+            subscribers = list(self.subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # Loop already closed, consumer is gone
+                self.unsubscribe((loop, queue))
+
+    @staticmethod
+    def _deliver(queue, event):
+        # Slow consumers lose their oldest events instead of blocking producers
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+bus = EventBus()
+
+
+def format_sse(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import cv2
+
+# -----------------------
+# Latest Frame Cache
+# -----------------------
+# One capture loop publishes every processed frame here. MJPEG streams wait for
+# the next sequence number, snapshot clients read whatever is newest. The JPEG
+# encoded for the stream is reused as-is; other sizes and qualities are encoded
+# at most once per frame and dropped when the next frame arrives.
+#
+# Sequence numbers restart with the process, so they are handed to clients
+# together with an epoch (the cache's creation time in milliseconds).
+
+DEFAULT_JPEG_QUALITY = 95  # OpenCV's default
+
+
+class FrameCache:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.epoch = str(int(time.time() * 1000))
+        self.sequence = 0
+        self.timestamp = 0.0
+        self.frame = None
+        self.jpeg = None
+        self.hands = []
+        self.variants = {}
+        self.last_access = 0.0
+
+    def update(self, frame, jpeg, hands):
+        with self.condition:
+            self.sequence += 1
+            self.timestamp = time.time()
+            self.frame = frame
+            self.jpeg = jpeg
+            self.hands = hands
+            self.variants = {}
+            self.condition.notify_all()
+
+    def token(self, sequence):
+        """Client-facing frame identifier, unique across server restarts"""
+        return f"{self.epoch}-{sequence}"
+
+    def touch(self):
+        self.last_access = time.time()
+
+    def wait_newer(self, sequence, timeout=None):
+        """Block until a frame newer than `sequence` exists, returns (sequence, jpeg) or None on timeout"""
+        self.touch()
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.sequence > sequence, timeout):
+                return None
+            return self.sequence, self.jpeg
+
+    def get_jpeg(self, width=None, quality=None):
+        """Newest frame as (sequence, jpeg), re-encoded only for a size/quality not yet served for it"""
+        self.touch()
+        with self.condition:
+            sequence, frame, jpeg = self.sequence, self.frame, self.jpeg
+            if frame is None:
+                return sequence, None
+            h, w = frame.shape[:2]
+            width = width if width and width < w else None
+            quality = quality if quality and quality != DEFAULT_JPEG_QUALITY else None
+            if width is None and quality is None:
+                return sequence, jpeg
+            cached = self.variants.get((width, quality))
+        if cached is not None:
+            return sequence, cached
+
+        if width is not None:
+            frame = cv2.resize(frame, (width, max(1, round(h * width / w))), interpolation=cv2.INTER_AREA)
+        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality or DEFAULT_JPEG_QUALITY])
+        if not ret:
+            return sequence, jpeg
+        encoded = buffer.tobytes()
+        with self.condition:
+            # Only keep it if no newer frame replaced the variants in the meantime
+            if self.sequence == sequence:
+                self.variants[(width, quality)] = encoded
+        return sequence, encoded
+
+    def get_landmarks(self):
+        self.touch()
+        with self.condition:
+            if self.frame is None:
+                return self.sequence, self.timestamp, None, []
+            return self.sequence, self.timestamp, self.frame.shape[:2], self.hands
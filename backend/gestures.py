@@ -0,0 +1,93 @@
+# MediaPipe Hands settings shared by the live stream and batch analysis
+HANDS_OPTIONS = dict(
+    static_image_mode=False,
+    max_num_hands=2,
+    min_detection_confidence=0.5,
+    min_tracking_confidence=0.5
+)
+
+# Multi-frame smoothing: a gesture is confirmed when it wins CONFIRM_VOTES of the last HISTORY_LENGTH frames
+HISTORY_LENGTH = 5
+CONFIRM_VOTES = 3
+
+# -----------------------
+# Gesture Detection Function (MediaPipe-based)
+# -----------------------
+def detect_static_gesture(hand_landmarks, frame):
+    landmarks = hand_landmarks.landmark
+    h, w, _ = frame.shape
+    xs = [lm.x for lm in landmarks]
+    ys = [lm.y for lm in landmarks]
+    x_min = min(xs) * w
+    x_max = max(xs) * w
+    y_min = min(ys) * h
+    y_max = max(ys) * h
+    hand_center_x = (x_min + x_max) / 2
+    hand_center_y = (y_min + y_max) / 2
+    hand_width = x_max - x_min
+
+    def finger_extended(tip_idx, pip_idx, delta=0.05):
+        hand_size = (x_max - x_min) * (y_max - y_min)
+        screen_size = w * h
+        hand_ratio = hand_size / screen_size
+        adjusted_delta = delta * 0.6 if hand_ratio < 0.05 else delta
+        return landmarks[tip_idx].y < (landmarks[pip_idx].y - adjusted_delta)
+
+    def finger_folded(tip_idx, pip_idx, margin=0.02):
+        return landmarks[tip_idx].y > (landmarks[pip_idx].y + margin)
+
+    index_ext = finger_extended(8, 6)
+    middle_ext = finger_extended(12, 10)
+    ring_ext = finger_extended(16, 14)
+    pinky_ext = finger_extended(20, 18)
+
+    middle_folded = finger_folded(12, 10)
+    ring_folded = finger_folded(16, 14)
+    pinky_folded = finger_folded(20, 18)
+
+    thumb_mcp = landmarks[2]
+    thumb_tip = landmarks[4]
+    delta_thumb = 0.025
+    thumb_up = (thumb_tip.y < thumb_mcp.y - delta_thumb) and (abs((thumb_tip.x * w) - hand_center_x) < hand_width * 0.3)
+    thumb_down = (thumb_tip.y > thumb_mcp.y + delta_thumb) and (abs((thumb_tip.x * w) - hand_center_x) < hand_width * 0.3)
+
+    # Define gestures
+    if index_ext and middle_ext and ring_ext and pinky_ext:
+        return "Open Palm"
+    elif index_ext and middle_ext and (not ring_ext) and (not pinky_ext):
+        return "Peace"
+    elif index_ext and pinky_ext and middle_folded and ring_folded:
+        return "Rock On"
+    elif (not index_ext and not middle_ext and not ring_ext and not pinky_ext) and thumb_up:
+        return "Thumbs Up"
+    elif (not index_ext and not middle_ext and not ring_ext and not pinky_ext) and thumb_down:
+        return "Thumbs Down"
+    elif index_ext and (not middle_ext) and (not ring_ext) and (not pinky_ext):
+        return "Point"
+    else:
+        return "Unrecognized"
+
+
+def hand_record(hand_landmarks, classification, gesture):
+    """Per-hand entry of /snapshot.json and the batch timeline, see add_confirmed for the rest"""
+    return {
+        "handedness": classification.label,
+        "score": round(classification.score, 4),
+        "landmarks": [[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark],
+        "gesture": gesture,
+    }
+
+
+def add_confirmed(records, confirmed):
+    """Fill in each hand record's smoothed gesture from {handedness: confirmed gesture}"""
+    for record in records:
+        record["confirmed"] = confirmed.get(record["handedness"])
+
+
+def confirm_gesture(history):
+    """Return the gesture seen in at least CONFIRM_VOTES frames of history, or None"""
+    if len(history) >= CONFIRM_VOTES:
+        candidate = max(set(history), key=history.count)
+        if history.count(candidate) >= CONFIRM_VOTES:
+            return candidate
+    return None
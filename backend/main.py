@@ -1,19 +1,34 @@
 import cv2
-import mediapipe as mp
 import math
 import platform
 import subprocess
 import ctypes
 import time
-from fastapi import FastAPI, Response
+import asyncio
+import os
+import shutil
+import tempfile
+from fastapi import FastAPI, File, HTTPException, Query, Request, Response, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 from collections import deque
 import threading
-import pyautogui
+import numpy as np
 
-from audio import start_speech_recognition, get_recognized_speech
+from batch import DEFAULT_OVERLAP_FRAMES, analyze_video
+from events import bus, format_sse
+from framecache import FrameCache
+from gestures import HANDS_OPTIONS, HISTORY_LENGTH, add_confirmed, confirm_gesture, hand_record
+from classifier import MODEL_PATH, Calibrator, CentroidClassifier, landmark_features, landmarks_to_array, load_classifier
+from trajectory import INDEX_TIP, HandTrajectory, detect_swipe, detect_circle, detect_pinch_drag
+from speechtokey import OS_CONTROL_ENABLED, get_pyautogui
+
+# Optional subsystems, disable for headless or viewer-only setups
+SPEECH_ENABLED = os.environ.get("ENABLE_SPEECH", "1") != "0"
+WARMUP_ENABLED = os.environ.get("ENABLE_WARMUP", "1") != "0"
+CAMERA_INDEX = int(os.environ.get("CAMERA_INDEX", "0"))
 
 app = FastAPI()
 app.add_middleware(
@@ -24,15 +39,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize MediaPipe Hands
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=2,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
-mp_drawing = mp.solutions.drawing_utils
+# MediaPipe Hands and the camera are created on first use (or by the startup warm-up)
+mp_hands = None
+mp_drawing = None
+hands = None
+camera = None
+init_lock = threading.Lock()
+camera_lock = threading.Lock()
+hands_lock = threading.Lock()
+capture_thread = None
+capture_lock = threading.Lock()
+capture_stop = threading.Event()  # set on shutdown, the capture loop exits and is not restarted
+capture_idle_timeout = 10.0  # seconds without viewers before the capture loop stops
+snapshot_only_fps = 2.0  # capture rate while only snapshot clients are polling
+video_viewers = 0  # open /video_feed streams; gestures only control the OS while this is > 0
+viewers_lock = threading.Lock()
+frame_cache = FrameCache()
+readiness = {"hands": False, "camera": False, "speech": "enabled" if SPEECH_ENABLED else "disabled"}
+
+# Gesture classifier backend ("rules" or a calibrated "centroid" model) and per-user calibration
+classifier = load_classifier()
+calibrator = Calibrator()
 
 # Global variables for smoothing
 last_volume_gesture_time = 0
@@ -42,19 +69,24 @@ music_gesture_cooldown = 2.0
 last_click_time = 0
 click_cooldown = 1.0
 
-left_gesture_history = deque(maxlen=5)
-right_gesture_history = deque(maxlen=5)
+left_gesture_history = deque(maxlen=HISTORY_LENGTH)
+right_gesture_history = deque(maxlen=HISTORY_LENGTH)
+
+# Timestamped landmark history per hand for dynamic gestures and velocity
+trajectories = {"Left": HandTrajectory(), "Right": HandTrajectory()}
+last_dynamic_gesture_time = 0
+dynamic_gesture_cooldown = 1.0
+pinch_dragging = False
 
 # Prev positions for cursor and scrolling
 prev_point_position = None
-prev_right_point_position = None
+prev_scroll_time = None
+scroll_velocity_window = 0.15  # seconds of fingertip history used to estimate scroll speed
 prev_rock_on = False
 
-# Speech recognition globals
-speech_recognition_active = False
-last_speech_text = None
-last_speech_time = 0
-speech_display_duration = 5.0  # seconds
+# Last published state, so events are only sent on change
+published_gestures = {"Left": None, "Right": None}
+published_scroll_mode = False
 
 # -----------------------
 # OS Control Functions
@@ -125,10 +157,10 @@ elif platform.system() == "Darwin":
         subprocess.run("osascript -e 'tell application \"System Events\" to keystroke space'", shell=True)
 
     def click_action():
-        pyautogui.click()
+        get_pyautogui().click()
 
     def move_cursor_absolute(x, y):
-        pyautogui.moveTo(x, y, duration=0.1)
+        get_pyautogui().moveTo(x, y, duration=0.1)
 else:
     def volume_up():
         print("Volume up not supported on this platform")
@@ -141,6 +173,35 @@ else:
     def move_cursor_absolute(x, y):
         print("Cursor control not supported on this platform")
 
+def get_hands():
+    """Import MediaPipe and build the Hands graph on first use"""
+    global mp_hands, mp_drawing, hands
+    if hands is None:
+        with init_lock:
+            if hands is None:
+                import mediapipe as mp
+                mp_hands = mp.solutions.hands
+                mp_drawing = mp.solutions.drawing_utils
+                hands = mp_hands.Hands(**HANDS_OPTIONS)
+    return hands
+
+def run_hands(rgb_frame):
+    """Run inference on the shared graph, which is not thread-safe; ready once a first pass has completed"""
+    graph = get_hands()
+    with hands_lock:
+        results = graph.process(rgb_frame)
+    readiness["hands"] = True
+    return results
+
+def get_camera():
+    """Open the shared camera on first use, reopening it if it was lost"""
+    global camera
+    with init_lock:
+        if camera is None or not camera.isOpened():
+            camera = cv2.VideoCapture(CAMERA_INDEX)
+            readiness["camera"] = camera.isOpened()
+    return camera
+
 def click_action_generic():
     if platform.system() == "Windows":
         click_action_windows()
@@ -152,117 +213,76 @@ def get_screen_size():
         user32 = ctypes.windll.user32
         return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
     elif platform.system() == "Darwin":
-        size = pyautogui.size()
+        size = get_pyautogui().size()
         return size.width, size.height
     else:
         return 800, 600
 
-# -----------------------
-# Gesture Detection Function (MediaPipe-based)
-# -----------------------
-def detect_static_gesture(hand_landmarks, frame):
-    landmarks = hand_landmarks.landmark
-    h, w, _ = frame.shape
-    xs = [lm.x for lm in landmarks]
-    ys = [lm.y for lm in landmarks]
-    x_min = min(xs) * w
-    x_max = max(xs) * w
-    y_min = min(ys) * h
-    y_max = max(ys) * h
-    hand_center_x = (x_min + x_max) / 2
-    hand_center_y = (y_min + y_max) / 2
-    hand_width = x_max - x_min
-
-    def finger_extended(tip_idx, pip_idx, delta=0.05):
-        hand_size = (x_max - x_min) * (y_max - y_min)
-        screen_size = w * h
-        hand_ratio = hand_size / screen_size
-        adjusted_delta = delta * 0.6 if hand_ratio < 0.05 else delta
-        return landmarks[tip_idx].y < (landmarks[pip_idx].y - adjusted_delta)
-
-    def finger_folded(tip_idx, pip_idx, margin=0.02):
-        return landmarks[tip_idx].y > (landmarks[pip_idx].y + margin)
-
-    index_ext = finger_extended(8, 6)
-    middle_ext = finger_extended(12, 10)
-    ring_ext = finger_extended(16, 14)
-    pinky_ext = finger_extended(20, 18)
-
-    middle_folded = finger_folded(12, 10)
-    ring_folded = finger_folded(16, 14)
-    pinky_folded = finger_folded(20, 18)
-
-    thumb_mcp = landmarks[2]
-    thumb_tip = landmarks[4]
-    delta_thumb = 0.025
-    thumb_up = (thumb_tip.y < thumb_mcp.y - delta_thumb) and (abs((thumb_tip.x * w) - hand_center_x) < hand_width * 0.3)
-    thumb_down = (thumb_tip.y > thumb_mcp.y + delta_thumb) and (abs((thumb_tip.x * w) - hand_center_x) < hand_width * 0.3)
-
-    # Define gestures
-    if index_ext and middle_ext and ring_ext and pinky_ext:
-        return "Open Palm"
-    elif index_ext and middle_ext and (not ring_ext) and (not pinky_ext):
-        return "Peace"
-    elif index_ext and pinky_ext and middle_folded and ring_folded:
-        return "Rock On"
-    elif (not index_ext and not middle_ext and not ring_ext and not pinky_ext) and thumb_up:
-        return "Thumbs Up"
-    elif (not index_ext and not middle_ext and not ring_ext and not pinky_ext) and thumb_down:
-        return "Thumbs Down"
-    elif index_ext and (not middle_ext) and (not ring_ext) and (not pinky_ext):
-        return "Point"
+def get_cursor_position():
+    if platform.system() == "Windows":
+        import ctypes.wintypes
+        pt = ctypes.wintypes.POINT()
+        ctypes.windll.user32.GetCursorPos(ctypes.byref(pt))
+        return pt.x, pt.y
+    elif platform.system() == "Darwin":
+        return get_pyautogui().position()
     else:
-        return "Unrecognized"
+        return 0, 0
+
+def scroll(amount):
+    get_pyautogui().scroll(amount)
+
+def mouse_down():
+    get_pyautogui().mouseDown()
+
+def mouse_up():
+    get_pyautogui().mouseUp()
+
+def move_cursor_relative(dx, dy):
+    get_pyautogui().moveRel(dx, dy)
+
+if not OS_CONTROL_ENABLED:
+    # Gestures are still recognized and published, but nothing touches the OS
+    def _os_control_disabled(*args, **kwargs):
+        pass
+
+    volume_up = volume_down = play_pause_music = click_action_generic = _os_control_disabled
+    move_cursor_absolute = move_cursor_relative = scroll = mouse_down = mouse_up = _os_control_disabled
+    get_screen_size = lambda: (800, 600)
+    get_cursor_position = lambda: (0, 0)
 
 # -----------------------
 # Frame Processing Function with Dual-Hand and Scroll Mode
 # -----------------------
-def process_frame(frame):
+def process_frame(frame, control=True):
+    """Detect and classify hands on one frame; OS actions only run when control is True"""
     global last_volume_gesture_time, last_click_time, last_music_gesture_time
-    global last_speech_text, last_speech_time, prev_point_position, prev_right_point_position, prev_rock_on
-    global left_gesture_history, right_gesture_history
+    global prev_point_position, prev_scroll_time, prev_rock_on
+    global left_gesture_history, right_gesture_history, published_scroll_mode
+    global last_dynamic_gesture_time, pinch_dragging
 
     current_time = time.time()
     frame = cv2.flip(frame, 1)
     rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb_frame)
+    results = run_hands(rgb_frame)
     h, w, _ = frame.shape
 
-    new_speech = get_recognized_speech()
-    if new_speech:
-        last_speech_text = new_speech
-        last_speech_time = current_time
-        print(f"New speech recognized: {new_speech}")
-
-    # Display speech recognition status and results
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    
-    # Display wake word instruction
-    cv2.putText(frame, "Say 'Hey Adam' to activate speech recognition", (10, h - 60), font, 0.6, (255, 255, 255), 2, cv2.LINE_AA)
-    
-    # Display the recognized speech if it's recent
-    if last_speech_text and (current_time - last_speech_time < speech_display_duration):
-        # Display recognition result with a background
-        text = f"Speech: {last_speech_text}"
-        text_size = cv2.getTextSize(text, font, 0.7, 2)[0]
-        
-        # Draw semi-transparent background for text
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, h - 40), (10 + text_size[0] + 20, h - 10), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
-        
-        cv2.putText(frame, text, (20, h - 20), font, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
-
-
-    # Gesture instructions overlay
-    cv2.putText(frame, "Vol Up/Down: Thumbs | Music: Rock On | Click: Open Palm | Cursor: Point | Scroll Mode: Left Peace + Right Point",
-                (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 2, cv2.LINE_AA)
-
     left_confirmed = None
     right_confirmed = None
     right_index_tip = None
+    seen_hands = set()
+    detected = []
 
     if results.multi_hand_landmarks and results.multi_handedness:
+        # Classify all hands in one batch
+        hand_labels = [handedness.classification[0].label for handedness in results.multi_handedness]
+        gestures = classifier.classify(results.multi_hand_landmarks, hand_labels, frame)
+        if calibrator.active and calibrator.hand in hand_labels:
+            i = hand_labels.index(calibrator.hand)
+            points = landmarks_to_array([results.multi_hand_landmarks[i]])
+            features, orientations = landmark_features(points, [calibrator.hand], w / h)
+            calibrator.add(features[0], orientations[0])
+
         for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
             mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
             xs = [lm.x for lm in hand_landmarks.landmark]
@@ -274,8 +294,14 @@ def process_frame(frame):
             cv2.rectangle(frame, (x_min_val, y_min_val), (x_max_val, y_max_val), (0,255,0), 2)
             
             # Get handedness label ("Left" or "Right")
-            handedness = results.multi_handedness[i].classification[0].label
-            gesture = detect_static_gesture(hand_landmarks, frame)
+            handedness = hand_labels[i]
+            # MediaPipe sometimes gives both hands the same label; mixing two hands in one
+            # trajectory fakes motion, so an ambiguous label records nothing this frame
+            if handedness in trajectories and hand_labels.count(handedness) == 1:
+                trajectories[handedness].push(current_time, hand_landmarks.landmark)
+                seen_hands.add(handedness)
+            gesture = gestures[i]
+            detected.append(hand_record(hand_landmarks, results.multi_handedness[i].classification[0], gesture))
             cv2.putText(frame, f"{handedness}: {gesture}", (x_min_val, y_min_val - 10),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (255,255,255), 2, cv2.LINE_AA)
             if handedness == "Left":
@@ -286,57 +312,79 @@ def process_frame(frame):
                     right_index_tip = hand_landmarks.landmark[8]
         
         # Confirm gestures with multi-frame smoothing (at least 3 of last 5 frames)
-        if len(left_gesture_history) >= 3:
-            candidate = max(set(left_gesture_history), key=left_gesture_history.count)
-            if left_gesture_history.count(candidate) >= 3:
-                left_confirmed = candidate
-        if len(right_gesture_history) >= 3:
-            candidate = max(set(right_gesture_history), key=right_gesture_history.count)
-            if right_gesture_history.count(candidate) >= 3:
-                right_confirmed = candidate
+        left_confirmed = confirm_gesture(left_gesture_history)
+        right_confirmed = confirm_gesture(right_gesture_history)
+
+        # Dynamic gestures over the recent trajectory of each hand
+        if current_time - last_dynamic_gesture_time > dynamic_gesture_cooldown:
+            for hand in seen_hands:
+                dynamic = detect_swipe(trajectories[hand]) or detect_circle(trajectories[hand])
+                if dynamic:
+                    print(f"{hand} hand: {dynamic}")
+                    bus.publish("dynamic", hand=hand, gesture=dynamic)
+                    last_dynamic_gesture_time = current_time
+                    break
+
+        # Right hand pinch holds the mouse button and drags with the pinch point
+        drag = detect_pinch_drag(trajectories["Right"]) if control and "Right" in seen_hands else None
+        if drag is not None:
+            if not pinch_dragging:
+                mouse_down()
+                pinch_dragging = True
+                bus.publish("action", action="drag_start")
+            screen_w, screen_h = get_screen_size()
+            move_cursor_relative(drag[0] * screen_w, drag[1] * screen_h)
+        elif pinch_dragging:
+            mouse_up()
+            pinch_dragging = False
+            bus.publish("action", action="drag_end")
 
         # Trigger actions based on right hand confirmed gesture
-        if right_confirmed == "Thumbs Up" and (current_time - last_volume_gesture_time > volume_gesture_cooldown):
+        if control and right_confirmed == "Thumbs Up" and (current_time - last_volume_gesture_time > volume_gesture_cooldown):
             volume_up()
             print("Volume increased")
+            bus.publish("action", action="volume_up")
             last_volume_gesture_time = current_time
-        elif right_confirmed == "Thumbs Down" and (current_time - last_volume_gesture_time > volume_gesture_cooldown):
+        elif control and right_confirmed == "Thumbs Down" and (current_time - last_volume_gesture_time > volume_gesture_cooldown):
             volume_down()
             print("Volume decreased")
+            bus.publish("action", action="volume_down")
             last_volume_gesture_time = current_time
 
         if right_confirmed == "Rock On":
-            if not prev_rock_on and (current_time - last_music_gesture_time > music_gesture_cooldown):
+            if control and not prev_rock_on and (current_time - last_music_gesture_time > music_gesture_cooldown):
                 play_pause_music()
                 print("Music toggled")
+                bus.publish("action", action="play_pause")
                 last_music_gesture_time = current_time
             prev_rock_on = True
         else:
             prev_rock_on = False
 
-        if right_confirmed == "Open Palm" and (current_time - last_click_time > click_cooldown):
+        if control and right_confirmed == "Open Palm" and (current_time - last_click_time > click_cooldown):
             click_action_generic()
             print("Click action triggered")
+            bus.publish("action", action="click")
             last_click_time = current_time
 
         # Determine if scroll mode is active: left hand is "Peace" and right hand is "Point"
         scroll_mode = (left_confirmed == "Peace" and right_confirmed == "Point")
-        if scroll_mode:
-            cv2.putText(frame, "Scroll Mode Active", (10, h - 80), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,255), 2, cv2.LINE_AA)
+        if scroll_mode and control:
             if right_index_tip is not None:
-                current_right_point = (right_index_tip.x * w, right_index_tip.y * h)
-                if prev_right_point_position is not None:
-                    dy = current_right_point[1] - prev_right_point_position[1]
+                if prev_scroll_time is not None:
+                    # Fingertip velocity over the window, scaled to this frame's interval
+                    _, vy = trajectories["Right"].velocity(INDEX_TIP, scroll_velocity_window)
+                    dy = vy * h * (current_time - prev_scroll_time)
                     scroll_amount = int(-dy * 3.5)  # Adjust scaling factor as needed
                     if scroll_amount != 0:
-                        pyautogui.scroll(scroll_amount)
+                        scroll(scroll_amount)
                         print("Scrolling", scroll_amount)
-                prev_right_point_position = current_right_point
+                prev_scroll_time = current_time
         else:
-            prev_right_point_position = None
+            prev_scroll_time = None
 
         # If not in scroll mode and right hand is "Point", use its movement to control the cursor
-        if (not scroll_mode) and (right_confirmed == "Point") and (right_index_tip is not None):
+        if control and (not scroll_mode) and (right_confirmed == "Point") and (right_index_tip is not None):
             screen_w, screen_h = get_screen_size()
             current_point = (right_index_tip.x * screen_w, right_index_tip.y * screen_h)
             global prev_point_position
@@ -345,59 +393,333 @@ def process_frame(frame):
             else:
                 dx = current_point[0] - prev_point_position[0]
                 dy = current_point[1] - prev_point_position[1]
-                if platform.system() == "Windows":
-                    import ctypes.wintypes
-                    pt = ctypes.wintypes.POINT()
-                    ctypes.windll.user32.GetCursorPos(ctypes.byref(pt))
-                    current_cursor = (pt.x, pt.y)
-                elif platform.system() == "Darwin":
-                    current_cursor = pyautogui.position()
-                else:
-                    current_cursor = (0, 0)
+                current_cursor = get_cursor_position()
                 new_cursor = (current_cursor[0] + dx, current_cursor[1] + dy)
                 move_cursor_absolute(new_cursor[0], new_cursor[1])
                 prev_point_position = current_point
         else:
             prev_point_position = None
 
-    return frame
+    add_confirmed(detected, {"Left": left_confirmed, "Right": right_confirmed})
+
+    # Hands that left the frame start a fresh trajectory when they return
+    for hand, trajectory in trajectories.items():
+        if hand not in seen_hands:
+            trajectory.clear()
+    if pinch_dragging and "Right" not in seen_hands:
+        mouse_up()
+        pinch_dragging = False
+        bus.publish("action", action="drag_end")
+
+    # Push state changes to event subscribers
+    for hand, confirmed in (("Left", left_confirmed), ("Right", right_confirmed)):
+        if confirmed != published_gestures[hand]:
+            published_gestures[hand] = confirmed
+            bus.publish("gesture", hand=hand, gesture=confirmed)
+    scroll_mode = (left_confirmed == "Peace" and right_confirmed == "Point")
+    if scroll_mode != published_scroll_mode:
+        published_scroll_mode = scroll_mode
+        bus.publish("scroll", active=scroll_mode)
+
+    return frame, detected
 
 # -----------------------
 # Video Streaming
 # -----------------------
-def generate_frames():
-    cap = cv2.VideoCapture(0)
+def capture_loop():
+    """Single camera + inference loop feeding frame_cache while anyone is watching"""
+    global capture_thread
+    frame_cache.touch()
     try:
-        while True:
-            success, frame = cap.read()
+        cap = get_camera()
+        while not capture_stop.is_set() and time.time() - frame_cache.last_access < capture_idle_timeout:
+            started = time.time()
+            with camera_lock:
+                success, frame = cap.read()
             if not success:
+                readiness["camera"] = False
                 break
-            processed_frame = process_frame(frame)
-            ret, buffer = cv2.imencode('.jpg', processed_frame)
+            # Snapshot polling alone never drives the OS, and only needs a low frame rate
+            viewing = video_viewers > 0
+            try:
+                processed_frame, detected = process_frame(frame, control=viewing)
+                ret, buffer = cv2.imencode('.jpg', processed_frame)
+            except Exception as e:
+                # One bad frame (or a failed OS action) must not stop the loop every viewer shares
+                print(f"Frame processing failed: {e!r}")
+                continue
             if not ret:
                 continue
-            frame_bytes = buffer.tobytes()
+            frame_cache.update(processed_frame, buffer.tobytes(), detected)
+            if not viewing:
+                capture_stop.wait(max(0.0, 1.0 / snapshot_only_fps - (time.time() - started)))
+    finally:
+        with capture_lock:
+            capture_thread = None
+
+def ensure_capture():
+    """Start the capture loop if it is not running, returns True if it was already running"""
+    global capture_thread
+    with capture_lock:
+        if capture_thread is not None:
+            return True
+        if capture_stop.is_set():
+            return False
+        capture_thread = threading.Thread(target=capture_loop, daemon=True)
+        capture_thread.start()
+        return False
+
+def generate_frames():
+    global video_viewers
+    with viewers_lock:
+        video_viewers += 1
+    try:
+        ensure_capture()
+        sequence = frame_cache.sequence
+        while True:
+            latest = frame_cache.wait_newer(sequence, timeout=1.0)
+            if latest is None:
+                # No new frame: keep waiting while the loop runs, restart it if it stopped
+                if capture_thread is None and not readiness["camera"]:
+                    break
+                ensure_capture()
+                continue
+            sequence, frame_bytes = latest
             yield (b'--frame\r\n'
                    b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
     finally:
-        cap.release()
+        with viewers_lock:
+            video_viewers -= 1
+
+def latest_frame_sequence(timeout=5.0):
+    """Sequence of a current frame, starting capture and waiting for a fresh frame if it was idle"""
+    if ensure_capture() and frame_cache.frame is not None:
+        return frame_cache.sequence
+    latest = frame_cache.wait_newer(frame_cache.sequence, timeout)
+    return latest[0] if latest else None
+
+def not_modified(request, etag, sequence, since):
+    """
+    True when the client already holds this frame. A `since` token from another
+    server process, or ahead of this one, is stale and gets the frame.
+    """
+    if since is not None:
+        return since == frame_cache.token(sequence)
+    return request.headers.get("if-none-match") == etag
+
+def warm_up():
+    """Open the camera and run a first inference so the first /video_feed frame has no stall"""
+    start = time.time()
+    try:
+        cap = get_camera()
+        with camera_lock:
+            success, frame = cap.read() if cap.isOpened() else (False, None)
+        if not success:
+            print("Warm-up: camera not available, warming up the model on a blank frame")
+            frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        # A blank frame initializes the graph without seeding hand tracking
+        run_hands(cv2.cvtColor(np.zeros_like(frame), cv2.COLOR_BGR2RGB))
+        print(f"Warm-up finished in {time.time() - start:.2f}s")
+    except Exception as e:
+        print(f"Warm-up failed: {e}")
 
 @app.get("/")
 async def root():
     return {"message": "Hand Gesture App with Dual-Hand Scroll Mode"}
 
+@app.get("/snapshot.jpg")
+async def snapshot(request: Request, width: int = Query(None, ge=1), quality: int = Query(None, ge=1, le=100), since: str = None):
+    """
+    Most recent processed frame as a JPEG, served from the frame cache.
+    Supports If-None-Match with the returned ETag, or ?since=<X-Frame-Sequence> for 304 when nothing is newer.
+    """
+    sequence = await run_in_threadpool(latest_frame_sequence)
+    if sequence is None:
+        raise HTTPException(status_code=503, detail="No frame available")
+    etag = f'"{frame_cache.token(sequence)}-{width or 0}-{quality or 0}"'
+    headers = {"ETag": etag, "X-Frame-Sequence": frame_cache.token(sequence), "Cache-Control": "no-cache"}
+    if not_modified(request, etag, sequence, since):
+        return Response(status_code=304, headers=headers)
+    sequence, jpeg = await run_in_threadpool(frame_cache.get_jpeg, width, quality)
+    headers.update({"ETag": f'"{frame_cache.token(sequence)}-{width or 0}-{quality or 0}"',
+                    "X-Frame-Sequence": frame_cache.token(sequence)})
+    return Response(content=jpeg, media_type="image/jpeg", headers=headers)
+
+@app.get("/snapshot.json")
+async def snapshot_landmarks(request: Request, since: str = None):
+    """Landmarks, raw and confirmed gestures of the most recent processed frame"""
+    sequence = await run_in_threadpool(latest_frame_sequence)
+    if sequence is None:
+        raise HTTPException(status_code=503, detail="No frame available")
+    sequence, timestamp, shape, detected = frame_cache.get_landmarks()
+    etag = f'"{frame_cache.token(sequence)}-landmarks"'
+    headers = {"ETag": etag, "X-Frame-Sequence": frame_cache.token(sequence), "Cache-Control": "no-cache"}
+    if not_modified(request, etag, sequence, since):
+        return Response(status_code=304, headers=headers)
+    content = {"sequence": frame_cache.token(sequence), "time": timestamp, "width": shape[1], "height": shape[0], "hands": detected}
+    return JSONResponse(content, headers=headers)
+
+@app.get("/ready")
+async def ready(response: Response):
+    """Readiness of the vision pipeline, 503 until the model is warmed up"""
+    is_ready = readiness["hands"]
+    if not is_ready:
+        response.status_code = 503
+    return {"ready": is_ready, **readiness}
+
 @app.get("/video_feed")
 async def video_feed():
     return StreamingResponse(generate_frames(), media_type='multipart/x-mixed-replace; boundary=frame')
 
+@app.get("/events")
+async def events():
+    """Server-Sent Events stream of speech, listening, gesture and action events"""
+    subscriber = bus.subscribe()
+
+    async def event_stream():
+        try:
+            for event in bus.snapshot():
+                yield format_sse(event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber[1].get(), timeout=15)
+                    yield format_sse(event)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            bus.unsubscribe(subscriber)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@app.websocket("/ws")
+async def events_ws(websocket: WebSocket):
+    """WebSocket variant of /events, one JSON message per event and a "ping" message when idle"""
+    await websocket.accept()
+    subscriber = bus.subscribe()
+
+    async def drain():
+        # Client messages are ignored, reading them is how a disconnect is noticed
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    receiver = asyncio.create_task(drain())
+    pending = None
+    try:
+        for event in bus.snapshot():
+            await websocket.send_json(event)
+        while True:
+            pending = pending or asyncio.ensure_future(subscriber[1].get())
+            done, _ = await asyncio.wait({pending, receiver}, timeout=15, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                break
+            if pending in done:
+                await websocket.send_json(pending.result())
+                pending = None
+            else:
+                await websocket.send_json({"type": "ping", "time": time.time()})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        if pending is not None:
+            pending.cancel()
+        bus.unsubscribe(subscriber)
+
+def save_upload(source, path):
+    with open(path, "wb") as f:
+        shutil.copyfileobj(source, f)
+
+@app.post("/analyze")
+async def analyze(file: UploadFile = File(...), workers: int = Query(None, ge=1),
+                  overlap: int = Query(DEFAULT_OVERLAP_FRAMES, ge=0), mirror: bool = True):
+    """Per-frame gesture timeline for an uploaded video, analysed in parallel worker processes"""
+    suffix = os.path.splitext(file.filename or "")[1] or ".mp4"
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        path = tmp.name
+    try:
+        # Uploads can be several GB, copy them off the event loop
+        await run_in_threadpool(save_upload, file.file, path)
+        return await run_in_threadpool(analyze_video, path, workers, overlap, mirror)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        os.remove(path)
+
+@app.get("/classifier")
+async def classifier_status():
+    return {"backend": classifier.name, "labels": classifier.labels, "calibration": calibrator.status()}
+
+@app.post("/calibration/start")
+async def calibration_start(gesture: str, samples: int = 30, hand: str = "Right"):
+    """Capture the next `samples` frames of `hand` as examples of `gesture`"""
+    if hand not in ("Left", "Right"):
+        raise HTTPException(status_code=400, detail="hand must be 'Left' or 'Right'")
+    calibrator.start(gesture, samples, hand)
+    return calibrator.status()
+
+@app.post("/calibration/fit")
+async def calibration_fit():
+    """Train a centroid model from the captured samples, merge it into the saved one and switch to it"""
+    global classifier
+    base = None
+    if os.path.exists(MODEL_PATH):
+        try:
+            base = CentroidClassifier.load(MODEL_PATH)
+        except Exception as e:
+            print(f"Replacing unreadable gesture model {MODEL_PATH}: {e}")
+    try:
+        model = calibrator.fit(base)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    model.save()
+    classifier = model
+    return {"backend": classifier.name, "labels": classifier.labels}
+
+@app.delete("/calibration")
+async def calibration_reset():
+    """Discard samples and the saved model, returning to the rule-based classifier"""
+    global classifier
+    calibrator.reset()
+    if os.path.exists(MODEL_PATH):
+        os.remove(MODEL_PATH)
+    classifier = load_classifier(backend="rules")
+    return {"backend": classifier.name}
+
 @app.on_event("startup")
 async def startup_event():
-    
+    if WARMUP_ENABLED:
+        threading.Thread(target=warm_up, daemon=True).start()
+
+    if not SPEECH_ENABLED:
+        print("Speech recognition disabled")
+        return
+
+    def start_speech():
+        # Imported here so speech_recognition and pyaudio only load when speech is enabled
+        from audio import start_speech_recognition
+        start_speech_recognition()
+        readiness["speech"] = "ready"
+
     # Start speech recognition in a background thread
-    threading.Thread(target=start_speech_recognition, daemon=True).start()
+    threading.Thread(target=start_speech, daemon=True).start()
     print("Speech recognition initialized with wake word: 'Hey Adam'")
     print("Speech will now be converted to keyboard input")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Stop the loop first, then release the camera between reads rather than during one
+    capture_stop.set()
+    thread = capture_thread
+    if thread is not None:
+        await run_in_threadpool(thread.join, 5.0)
+    if camera is not None:
+        with camera_lock:
+            camera.release()
+    if readiness["speech"] == "ready":
+        from audio import stop_speech_recognition
+        stop_speech_recognition()
+
 
 if __name__ == '__main__':
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
@@ -1,102 +1,223 @@
-import pyautogui
+import os
 import platform
+import re
 import time
+from functools import lru_cache
 
-# Set fail-safe to False to prevent mouse corner triggering safety feature
-pyautogui.FAILSAFE = False
+# ENABLE_OS_CONTROL=0 keeps both gestures and speech from sending input to the OS
+OS_CONTROL_ENABLED = os.environ.get("ENABLE_OS_CONTROL", "1") != "0"
 
-# On Windows, use faster key presses with no delay
-if platform.system() == "Windows":
-    # Optional: adjust for Windows environment
-    pyautogui.PAUSE = 0.01  # Smaller pause between PyAutoGUI commands
+_pyautogui = None
 
-def speech_to_keyboard(text):
+
+def get_pyautogui():
+    """Import and configure pyautogui on first use, it needs a display and is slow to load"""
+    global _pyautogui
+    if _pyautogui is None:
+        import pyautogui
+
+        # Set fail-safe to False to prevent mouse corner triggering safety feature
+        pyautogui.FAILSAFE = False
+
+        # On Windows, use faster key presses with no delay
+        if platform.system() == "Windows":
+            # Optional: adjust for Windows environment
+            pyautogui.PAUSE = 0.01  # Smaller pause between PyAutoGUI commands
+        _pyautogui = pyautogui
+    return _pyautogui
+
+# -----------------------
+# Voice Command Registry
+# -----------------------
+# Each command maps to the phrases that trigger it and the keys it sends.
+# A single key is pressed, several keys are sent as a chord. Keys written as
+# "<name>" are placeholders resolved per OS through KEY_MAPS below.
+COMMANDS = {
+    "enter": (["press enter", "enter key", "hit enter", "new line"], ["enter"]),
+    "tab": (["press tab", "tab key", "hit tab"], ["tab"]),
+    "space": (["press space", "space bar", "hit space", "press space bar", "hit space bar"], ["space"]),
+    "backspace": (["press backspace", "backspace", "delete", "press delete"], ["backspace"]),
+    "escape": (["press escape", "escape key", "hit escape"], ["escape"]),
+    "select all": (["select all"], ["<mod>", "a"]),
+    "copy": (["copy", "copy that"], ["<mod>", "c"]),
+    "paste": (["paste", "paste that"], ["<mod>", "v"]),
+    "cut": (["cut", "cut that"], ["<mod>", "x"]),
+    "undo": (["undo", "undo that"], ["<mod>", "z"]),
+    "redo": (["redo", "redo that"], ["<mod>", "<redo>"]),
+    "save": (["save", "save file"], ["<mod>", "s"]),
+    "new tab": (["new tab", "open tab", "open new tab"], ["<mod>", "t"]),
+    "close tab": (["close tab"], ["<mod>", "w"]),
+    "switch app": (["alt tab", "switch app", "switch window"], ["<switch>", "tab"]),
+    "start menu": (["windows key", "start menu"], ["<super>"]),
+}
+
+# Per-OS resolution of the "<name>" placeholders used in COMMANDS, a tuple
+# expands to several keys of the chord
+KEY_MAPS = {
+    "Windows": {"mod": "ctrl", "switch": "alt", "super": "win", "redo": "y"},
+    "Darwin": {"mod": "command", "switch": "command", "super": "command", "redo": ("shift", "z")},
+    "Linux": {"mod": "ctrl", "switch": "alt", "super": "winleft", "redo": "y"},
+}
+
+# Words the recognizer tends to insert around commands ("press the enter")
+FILLER_WORDS = {"the", "a", "an", "please", "button", "now"}
+
+# Phrases starting with these are explicit enough to be picked out of longer
+# dictation ("hello world press enter"); all other phrases must be the whole utterance
+EMBEDDED_TRIGGERS = {"press", "hit"}
+
+# A single key command spoken with a trigger may also end in this word ("press enter key")
+KEY_SUFFIX = "key"
+
+# Spoken tokens shorter than this are only matched exactly, to keep dictation intact
+FUZZY_MIN_LENGTH = 5
+
+# Matched case-insensitively on the original text: lowercasing first can change
+# its length ("İ"), which would shift the offsets used to slice out dictation
+_token_pattern = re.compile(r"[a-z0-9']+", re.IGNORECASE)
+
+
+def _tokens(text):
+    """Lowercased tokens of text"""
+    return [token.lower() for token in _token_pattern.findall(text)]
+
+
+def _deletions(word):
+    """All strings reachable from word by deleting a single character"""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class CommandIndex:
     """
-    Convert speech text to keyboard input for Windows
-    This types the text as if it were typed on the keyboard
-    
-    Args:
-        text (str): The recognized speech text to type
+    Normalized lookup index over a command registry.
+
+    Phrases are stored as tuples of canonical tokens in a dict, so matching an
+    utterance costs a handful of hash lookups per word regardless of how many
+    commands are registered. Misrecognized words with one letter dropped or
+    added are corrected through a deletion index, which is also a hash lookup
+    rather than a scan over the vocabulary. Same-length substitutions are not
+    corrected, they turn too many ordinary words into commands ("have" -> "save").
     """
-    if not text or len(text) == 0:
-        print("Warning: Empty text received, nothing to type")
-        return
-    
-    print(f"Processing text for typing: '{text}'")
-    
-    # Special command handling
-    lower_text = text.lower().strip()
-    
-    # Handle Windows-specific key commands
-    if lower_text == "press enter":
-        print("Executing command: press enter")
-        pyautogui.press('enter')
-        return
-    elif lower_text == "press tab":
-        print("Executing command: press tab")
-        pyautogui.press('tab')
-        return
-    elif lower_text == "press space":
-        print("Executing command: press space")
-        pyautogui.press('space')
-        return
-    elif lower_text == "press backspace" or lower_text == "delete":
-        print("Executing command: backspace")
-        pyautogui.press('backspace')
-        return
-    elif lower_text == "press escape":
-        print("Executing command: escape")
-        pyautogui.press('escape')
-        return
-    elif lower_text == "select all":
-        print("Executing command: select all")
-        pyautogui.hotkey('ctrl', 'a')  # Windows uses ctrl+a
-        return
-    elif lower_text == "copy":
-        print("Executing command: copy")
-        pyautogui.hotkey('ctrl', 'c')  # Windows uses ctrl+c
-        return
-    elif lower_text == "paste":
-        print("Executing command: paste")
-        pyautogui.hotkey('ctrl', 'v')  # Windows uses ctrl+v
-        return
-    elif lower_text == "cut":
-        print("Executing command: cut")
-        pyautogui.hotkey('ctrl', 'x')  # Windows uses ctrl+x
-        return
-    elif lower_text == "undo":
-        print("Executing command: undo")
-        pyautogui.hotkey('ctrl', 'z')  # Windows uses ctrl+z
-        return
-    elif lower_text == "save":
-        print("Executing command: save")
-        pyautogui.hotkey('ctrl', 's')  # Windows save shortcut
-        return
-    elif lower_text == "new tab":
-        print("Executing command: new tab")
-        pyautogui.hotkey('ctrl', 't')  # Common in browsers
-        return
-    elif lower_text == "close tab":
-        print("Executing command: close tab")
-        pyautogui.hotkey('ctrl', 'w')  # Common in browsers
-        return
-    elif lower_text == "new line":
-        print("Executing command: new line")
-        pyautogui.press('enter')
-        return
-    elif lower_text == "alt tab":
-        print("Executing command: alt tab")
-        pyautogui.hotkey('alt', 'tab')  # Windows app switching
-        return
-    elif lower_text == "windows key":
-        print("Executing command: windows key")
-        pyautogui.press('win')  # Open Start menu
-        return
-    elif lower_text == "delete":
-        pyautogui.press('backspace')
-        return
-    
-    # Typing normal text
+
+    def __init__(self, commands, system=None):
+        key_map = KEY_MAPS.get(system or platform.system(), KEY_MAPS["Linux"])
+        self.phrases = {}
+        self.vocabulary = set()
+        self.deletions = {}
+        self.max_phrase_length = 1
+        for name, (phrases, keys) in commands.items():
+            self.add(name, phrases, keys, key_map)
+        self.canonical_token = lru_cache(maxsize=4096)(self._canonical_token)
+
+    def add(self, name, phrases, keys, key_map):
+        resolved = ()
+        for key in keys:
+            if key.startswith("<"):
+                key = key_map.get(key[1:-1], key[1:-1])
+            resolved += (key,) if isinstance(key, str) else tuple(key)
+        for phrase in phrases:
+            tokens = tuple(token for token in _tokens(phrase) if token not in FILLER_WORDS)
+            if not tokens:
+                continue
+            self.phrases[tokens] = (name, resolved)
+            if len(resolved) == 1 and tokens[0] in EMBEDDED_TRIGGERS and tokens[-1] != KEY_SUFFIX:
+                self.phrases.setdefault(tokens + (KEY_SUFFIX,), (name, resolved))
+                tokens += (KEY_SUFFIX,)
+            self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+            for token in tokens:
+                if token in self.vocabulary:
+                    continue
+                self.vocabulary.add(token)
+                for variant in _deletions(token):
+                    self.deletions.setdefault(variant, set()).add(token)
+
+    def _canonical_token(self, token):
+        """Map a spoken token onto the command vocabulary, or return it unchanged"""
+        if token in self.vocabulary or len(token) < FUZZY_MIN_LENGTH:
+            return token
+        # Spoken word missing a letter, or carrying an extra one
+        candidates = set(self.deletions.get(token, ()))
+        candidates.update(variant for variant in _deletions(token) if variant in self.vocabulary)
+        return candidates.pop() if len(candidates) == 1 else token
+
+    def parse(self, text):
+        """
+        Split an utterance into ordered ("text", str) and ("command", (name, keys)) segments.
+
+        Commands starting with an EMBEDDED_TRIGGERS word are recognized anywhere in
+        the utterance; all others ("copy", "cut that") only when they are the whole
+        utterance, and a single-word command must then be heard exactly, so
+        ordinary dictation is not hijacked. Filler left next to a command is
+        dropped; an utterance without a command is returned unchanged.
+        """
+        words = [(m.group().lower(), m.start(), m.end()) for m in _token_pattern.finditer(text)]
+        content_words = sum(1 for word, _, _ in words if word not in FILLER_WORDS)
+
+        segments = []
+        text_start = 0
+        i = 0
+        while i < len(words):
+            match = None
+            if words[i][0] not in FILLER_WORDS:
+                key = ()
+                j = i
+                while j < len(words) and len(key) < self.max_phrase_length:
+                    word = words[j][0]
+                    if word not in FILLER_WORDS:
+                        key += (self.canonical_token(word),)
+                        command = self.phrases.get(key)
+                        if command:
+                            if len(key) == content_words:
+                                allowed = len(key) > 1 or key[0] == word
+                            else:
+                                allowed = key[0] in EMBEDDED_TRIGGERS
+                            if allowed:
+                                match = (command, j)
+                    j += 1
+            if match is None:
+                i += 1
+                continue
+            command, end = match
+            self._append_text(segments, text[text_start:words[i][1]])
+            segments.append(("command", command))
+            text_start = words[end][2]
+            i = end + 1
+
+        if not segments:
+            # No command heard: type the utterance as spoken, filler words included
+            return [("text", text)] if text.strip() else []
+        self._append_text(segments, text[text_start:])
+        return segments
+
+    @staticmethod
+    def _append_text(segments, fragment):
+        """Keep dictation left around a command unless it is only punctuation or filler"""
+        fragment = fragment.strip().lstrip(",.;:!?").strip()
+        if any(word not in FILLER_WORDS for word in _tokens(fragment)):
+            segments.append(("text", fragment))
+
+
+command_index = CommandIndex(COMMANDS)
+
+
+def register_command(name, phrases, keys):
+    """Add a voice command at runtime, e.g. register_command("find", ["find"], ["<mod>", "f"])"""
+    key_map = KEY_MAPS.get(platform.system(), KEY_MAPS["Linux"])
+    command_index.add(name, phrases, keys, key_map)
+    command_index.canonical_token.cache_clear()
+
+
+def execute_command(name, keys):
+    print(f"Executing command: {name}")
+    pyautogui = get_pyautogui()
+    if len(keys) == 1:
+        pyautogui.press(keys[0])
+    else:
+        pyautogui.hotkey(*keys)
+
+
+def type_text(text):
+    pyautogui = get_pyautogui()
     try:
         print(f"Typing text: '{text}'")
         if platform.system() == "Windows":
@@ -116,4 +237,30 @@ def speech_to_keyboard(text):
                 time.sleep(0.01)
             print("Alternative typing completed")
         except Exception as e2:
-            print(f"Alternative typing method also failed: {e2}")
\ No newline at end of file
+            print(f"Alternative typing method also failed: {e2}")
+
+
+def speech_to_keyboard(text):
+    """
+    Convert speech text to keyboard input
+    Recognized commands are sent as key presses or chords, everything else
+    is typed as if it were typed on the keyboard
+
+    Args:
+        text (str): The recognized speech text to type
+    """
+    if not text or len(text) == 0:
+        print("Warning: Empty text received, nothing to type")
+        return
+
+    if not OS_CONTROL_ENABLED:
+        print(f"OS control disabled, not typing: '{text}'")
+        return
+
+    print(f"Processing text for typing: '{text}'")
+
+    for kind, value in command_index.parse(text):
+        if kind == "command":
+            execute_command(*value)
+        else:
+            type_text(value)
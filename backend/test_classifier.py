@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from classifier import CentroidClassifier, landmark_features
+
+
+def rotate(points, degrees):
+    """Rotate landmarks in the image plane around the wrist"""
+    angle = np.radians(degrees)
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+    rotated = points.copy()
+    wrist = points[:, :1, :2]
+    rotated[:, :, :2] = (points[:, :, :2] - wrist) @ rotation.T + wrist
+    return rotated
+
+
+@pytest.fixture(scope="module")
+def thumbs_up():
+    rng = np.random.default_rng(0)
+    hand = np.zeros((1, 21, 3))
+    hand[0, :, :2] = 0.5 + rng.uniform(-0.1, 0.1, (21, 2))
+    hand[0, 9, :2] = hand[0, 0, :2] + (0.1, 0.0)  # knuckles point sideways, as in a thumbs up
+    return hand
+
+
+def fit(samples):
+    """Centroid model from {label: hand} with a little jitter per sample"""
+    rng = np.random.default_rng(1)
+    features, orientations = {}, {}
+    for label, hand in samples.items():
+        batch = np.repeat(hand, 10, axis=0) + rng.normal(0, 0.002, (10, 21, 3))
+        features[label], orientations[label] = landmark_features(batch, ["Right"] * 10)
+    return CentroidClassifier.fit(features, orientations)
+
+
+@pytest.mark.parametrize("degrees", [15, 45, 80])
+def test_features_are_rotation_invariant(thumbs_up, degrees):
+    features, _ = landmark_features(thumbs_up, ["Right"])
+    rotated, _ = landmark_features(rotate(thumbs_up, degrees), ["Right"])
+    np.testing.assert_allclose(rotated, features, atol=1e-9)
+
+
+@pytest.mark.parametrize("degrees", [0, 30, -60])
+def test_tilted_hand_matches(thumbs_up, degrees):
+    model = fit({"Thumbs Up": thumbs_up})
+    assert model.predict(*landmark_features(rotate(thumbs_up, degrees), ["Right"])) == ["Thumbs Up"]
+
+
+def test_opposite_orientation_falls_back_to_rules(thumbs_up):
+    model = fit({"Thumbs Up": thumbs_up})
+    assert model.predict(*landmark_features(rotate(thumbs_up, 180), ["Right"])) == [None]
+
+
+def test_opposite_orientation_picks_matching_class(thumbs_up):
+    model = fit({"Thumbs Up": thumbs_up, "Thumbs Down": rotate(thumbs_up, 180)})
+    features, orientations = landmark_features(np.concatenate([thumbs_up, rotate(thumbs_up, 180)]), ["Right"] * 2)
+    assert model.predict(features, orientations) == ["Thumbs Up", "Thumbs Down"]
+
+
+def test_merge_keeps_classes_not_recalibrated(thumbs_up):
+    saved = fit({"Thumbs Up": thumbs_up, "Thumbs Down": rotate(thumbs_up, 180)})
+    model = saved.merge(fit({"Thumbs Up": rotate(thumbs_up, 10)}))
+    assert sorted(model.labels) == ["Thumbs Down", "Thumbs Up"]
+    np.testing.assert_allclose(model.orientations[model.labels.index("Thumbs Down")],
+                               saved.orientations[saved.labels.index("Thumbs Down")])
+    assert not np.allclose(model.orientations[model.labels.index("Thumbs Up")],
+                           saved.orientations[saved.labels.index("Thumbs Up")])
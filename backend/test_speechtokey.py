@@ -0,0 +1,71 @@
+import pytest
+
+from speechtokey import COMMANDS, CommandIndex
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CommandIndex(COMMANDS, system="Windows")
+
+
+def commands(segments):
+    return [value[0] for kind, value in segments if kind == "command"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("press enter", ["enter"]),
+    ("press the enter", ["enter"]),
+    ("new-tab", ["new tab"]),
+    ("copy", ["copy"]),
+    ("windows key", ["start menu"]),
+    ("escape key", ["escape"]),
+    ("press enterr", ["enter"]),
+    ("press escpe", ["escape"]),
+    ("press the enter key", ["enter"]),
+    ("press enter key", ["enter"]),
+    ("hit the escape key", ["escape"]),
+    ("press the space bar", ["space"]),
+])
+def test_recognizes_commands(index, text, expected):
+    assert commands(index.parse(text)) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "have",
+    "wave",
+    "past that",
+    "I have to cut that wood",
+    "I want to copy this",
+    "windows",
+    "escape",
+    "enter",
+    "tab",
+    "new tabb please and more",
+    "now",
+    "please",
+    "the",
+    "Now.",
+])
+def test_dictation_is_typed(index, text):
+    assert index.parse(text) == [("text", text)]
+
+
+def test_key_suffix_is_part_of_the_command(index):
+    assert index.parse("press the enter key") == [("command", ("enter", ("enter",)))]
+    assert index.parse("press the space bar") == [("command", ("space", ("space",)))]
+    assert index.parse("hello press tab key world") == [
+        ("text", "hello"), ("command", ("tab", ("tab",))), ("text", "world")]
+
+
+def test_command_embedded_in_dictation(index):
+    assert index.parse("hello world press enter") == [("text", "hello world"), ("command", ("enter", ("enter",)))]
+    assert index.parse("Press Enter. Hello there") == [("command", ("enter", ("enter",))), ("text", "Hello there")]
+    # "İ" grows when lowercased, dictation must still be cut at the right place
+    assert index.parse("İstanbul press enter") == [("text", "İstanbul"), ("command", ("enter", ("enter",)))]
+
+
+def test_chords_follow_os():
+    assert CommandIndex(COMMANDS, system="Darwin").parse("copy") == [("command", ("copy", ("command", "c")))]
+    assert CommandIndex(COMMANDS, system="Windows").parse("copy") == [("command", ("copy", ("ctrl", "c")))]
+    assert CommandIndex(COMMANDS, system="Darwin").parse("redo") == [("command", ("redo", ("command", "shift", "z")))]
+    assert CommandIndex(COMMANDS, system="Windows").parse("redo") == [("command", ("redo", ("ctrl", "y")))]
@@ -0,0 +1,157 @@
+import numpy as np
+
+# -----------------------
+# Landmark Trajectories
+# -----------------------
+# Each hand keeps a fixed-size ring buffer of timestamped landmarks. Windows are
+# gathered into preallocated scratch arrays with out= operations, so the
+# dynamic gesture detectors below run vectorized without allocating array
+# buffers per frame; only NumPy scalars and slice views are created.
+
+NUM_LANDMARKS = 21
+WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_MCP = 0, 4, 8, 9
+
+SWIPE_WINDOW = 0.35        # seconds
+SWIPE_DISTANCE = 0.25      # fraction of the frame width/height
+CIRCLE_WINDOW = 1.2        # seconds
+CIRCLE_MIN_RADIUS = 0.04   # fraction of the frame
+CIRCLE_MAX_RADIUS_CV = 0.35
+CIRCLE_MIN_TURN = 0.85     # fraction of a full turn
+PINCH_RATIO = 0.3          # thumb-index distance relative to palm size
+PINCH_FRAMES = 3
+
+
+class HandTrajectory:
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.times = np.zeros(capacity)
+        self.points = np.zeros((capacity, NUM_LANDMARKS, 3))
+        self.head = 0
+        self.count = 0
+        # Scratch space reused by every window query
+        self._steps = np.arange(capacity)
+        self._order = np.empty(capacity, dtype=np.intp)
+        self._window_times = np.empty(capacity)
+        self._window_points = np.empty((capacity, NUM_LANDMARKS, 3))
+        self._scratch = np.empty((4, capacity))
+        self._flags = np.empty(capacity, dtype=bool)
+
+    def push(self, timestamp, landmarks):
+        """Record a MediaPipe landmark list, writing in place into the next slot"""
+        slot = self.points[self.head]
+        for i, lm in enumerate(landmarks):
+            slot[i, 0] = lm.x
+            slot[i, 1] = lm.y
+            slot[i, 2] = lm.z
+        self.times[self.head] = timestamp
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self):
+        self.count = 0
+
+    def _gather(self, n):
+        """Copy the newest n samples, oldest first, into the scratch window"""
+        order = self._order[:n]
+        np.add(self._steps[:n], self.head - n, out=order)
+        np.remainder(order, self.capacity, out=order)
+        np.take(self.times, order, out=self._window_times[:n])
+        np.take(self.points, order, axis=0, out=self._window_points[:n])
+        return self._window_times[:n], self._window_points[:n]
+
+    def recent(self, n):
+        """Newest n samples (fewer if not yet recorded) as (times, points) views"""
+        return self._gather(min(n, self.count))
+
+    def window(self, duration):
+        """Samples from the last `duration` seconds as (times, points) views"""
+        if self.count == 0:
+            return self._gather(0)
+        times, points = self._gather(self.count)
+        first = np.searchsorted(times, times[-1] - duration)
+        return times[first:], points[first:]
+
+    def velocity(self, landmark, duration):
+        """Least-squares (vx, vy) of one landmark over the window, in normalized units per second"""
+        times, points = self.window(duration)
+        n = len(times)
+        if n < 2:
+            return 0.0, 0.0
+        centered = self._scratch[0, :n]
+        np.subtract(times, times.mean(), out=centered)
+        denom = np.dot(centered, centered)
+        if denom <= 0:
+            return 0.0, 0.0
+        return (float(np.dot(centered, points[:, landmark, 0]) / denom),
+                float(np.dot(centered, points[:, landmark, 1]) / denom))
+
+
+def detect_swipe(trajectory):
+    """Fast straight palm movement: returns "Swipe Left/Right/Up/Down" or None"""
+    times, points = trajectory.window(SWIPE_WINDOW)
+    if len(times) < 4:
+        return None
+    dx = points[-1, MIDDLE_MCP, 0] - points[0, MIDDLE_MCP, 0]
+    dy = points[-1, MIDDLE_MCP, 1] - points[0, MIDDLE_MCP, 1]
+    if abs(dx) > SWIPE_DISTANCE and abs(dx) > 2 * abs(dy):
+        return "Swipe Right" if dx > 0 else "Swipe Left"
+    if abs(dy) > SWIPE_DISTANCE and abs(dy) > 2 * abs(dx):
+        return "Swipe Down" if dy > 0 else "Swipe Up"
+    return None
+
+
+def detect_circle(trajectory):
+    """Index fingertip tracing a loop: returns "Circle Clockwise/Counterclockwise" or None"""
+    times, points = trajectory.window(CIRCLE_WINDOW)
+    n = len(times)
+    if n < 10:
+        return None
+    xs = trajectory._scratch[0, :n]
+    ys = trajectory._scratch[1, :n]
+    radii = trajectory._scratch[2, :n]
+    angles = trajectory._scratch[3, :n]
+    np.subtract(points[:, INDEX_TIP, 0], points[:, INDEX_TIP, 0].mean(), out=xs)
+    np.subtract(points[:, INDEX_TIP, 1], points[:, INDEX_TIP, 1].mean(), out=ys)
+    np.hypot(xs, ys, out=radii)
+    mean_radius = radii.mean()
+    if mean_radius < CIRCLE_MIN_RADIUS:
+        return None
+    # Spread of the radius, with the angle row as scratch (std() would allocate)
+    np.square(radii, out=angles)
+    if angles.mean() - mean_radius ** 2 > (CIRCLE_MAX_RADIUS_CV * mean_radius) ** 2:
+        return None
+    np.arctan2(ys, xs, out=angles)
+    # Wrapped angle steps, written over the x scratch row
+    steps = xs[:n - 1]
+    np.subtract(angles[1:], angles[:-1], out=steps)
+    np.add(steps, np.pi, out=steps)
+    np.remainder(steps, 2 * np.pi, out=steps)
+    np.subtract(steps, np.pi, out=steps)
+    turn = steps.sum()
+    if abs(turn) < CIRCLE_MIN_TURN * 2 * np.pi:
+        return None
+    # Image y points down, so a positive turn is clockwise on screen
+    return "Circle Clockwise" if turn > 0 else "Circle Counterclockwise"
+
+
+def detect_pinch_drag(trajectory):
+    """
+    Thumb and index tips held together for PINCH_FRAMES samples.
+    Returns the (dx, dy) movement of the pinch point since the previous sample, or None.
+    """
+    times, points = trajectory.recent(PINCH_FRAMES)
+    if len(times) < PINCH_FRAMES:
+        return None
+    gaps, palms, ddx, ddy = trajectory._scratch[:, :PINCH_FRAMES]
+    np.subtract(points[:, THUMB_TIP, 0], points[:, INDEX_TIP, 0], out=ddx)
+    np.subtract(points[:, THUMB_TIP, 1], points[:, INDEX_TIP, 1], out=ddy)
+    np.hypot(ddx, ddy, out=gaps)
+    np.subtract(points[:, WRIST, 0], points[:, MIDDLE_MCP, 0], out=ddx)
+    np.subtract(points[:, WRIST, 1], points[:, MIDDLE_MCP, 1], out=ddy)
+    np.hypot(ddx, ddy, out=palms)
+    np.multiply(palms, PINCH_RATIO, out=palms)
+    if not np.less(gaps, palms, out=trajectory._flags[:PINCH_FRAMES]).all():
+        return None
+    dx = (points[-1, THUMB_TIP, 0] + points[-1, INDEX_TIP, 0] - points[-2, THUMB_TIP, 0] - points[-2, INDEX_TIP, 0]) / 2
+    dy = (points[-1, THUMB_TIP, 1] + points[-1, INDEX_TIP, 1] - points[-2, THUMB_TIP, 1] - points[-2, INDEX_TIP, 1]) / 2
+    return float(dx), float(dy)
@@ -1,16 +1,74 @@
 import { useEffect, useRef, useState } from 'react';
 import './App.css';
 
+const BACKEND_URL = 'http://localhost:8001';
+const SPEECH_DISPLAY_MS = 5000;
+
+type BackendEvent =
+  | { type: 'speech'; time: number; text: string }
+  | { type: 'listening'; time: number; active: boolean }
+  | { type: 'gesture'; time: number; hand: 'Left' | 'Right'; gesture: string | null }
+  | { type: 'dynamic'; time: number; hand: 'Left' | 'Right'; gesture: string }
+  | { type: 'scroll'; time: number; active: boolean }
+  | { type: 'action'; time: number; action: string };
+
 function App() {
-  const videoRef = useRef(null);
-  const [gestureText, setGestureText] = useState("Vol Up/Down: Thumbs | Music: Rock On | Click: Open Palm | Cursor: Pointing");
+  const videoRef = useRef<HTMLImageElement>(null);
+  const [gestureText] = useState("Vol Up/Down: Thumbs | Music: Rock On | Click: Open Palm | Cursor: Pointing | Scroll: Left Peace + Right Point");
+  const [listening, setListening] = useState(false);
+  const [speech, setSpeech] = useState<string | null>(null);
+  const [gestures, setGestures] = useState<Record<string, string | null>>({ Left: null, Right: null });
+  const [scrollMode, setScrollMode] = useState(false);
+  const [lastAction, setLastAction] = useState<string | null>(null);
 
   useEffect(() => {
     if (videoRef.current) {
-      videoRef.current.src = 'http://localhost:8001/video_feed';
+      videoRef.current.src = `${BACKEND_URL}/video_feed`;
     }
   }, []);
 
+  useEffect(() => {
+    const source = new EventSource(`${BACKEND_URL}/events`);
+    let speechTimer: number | undefined;
+
+    const handle = (message: MessageEvent) => {
+      const event: BackendEvent = JSON.parse(message.data);
+      switch (event.type) {
+        case 'speech': {
+          const age = Date.now() - event.time * 1000;
+          if (age > SPEECH_DISPLAY_MS) break;
+          setSpeech(event.text);
+          window.clearTimeout(speechTimer);
+          speechTimer = window.setTimeout(() => setSpeech(null), SPEECH_DISPLAY_MS - age);
+          break;
+        }
+        case 'listening':
+          setListening(event.active);
+          break;
+        case 'gesture':
+          setGestures((prev) => ({ ...prev, [event.hand]: event.gesture }));
+          break;
+        case 'dynamic':
+          setLastAction(`${event.hand} ${event.gesture}`);
+          break;
+        case 'scroll':
+          setScrollMode(event.active);
+          break;
+        case 'action':
+          setLastAction(event.action);
+          break;
+      }
+    };
+
+    for (const type of ['speech', 'listening', 'gesture', 'dynamic', 'scroll', 'action']) {
+      source.addEventListener(type, handle);
+    }
+    return () => {
+      window.clearTimeout(speechTimer);
+      source.close();
+    };
+  }, []);
+
   return (
     <div className="App">
       <h1>Hand Detection App</h1>
@@ -18,13 +76,25 @@ function App() {
       <div className="video-container">
         <img ref={videoRef} alt="Video feed" />
 
+        {/* Live status pushed from the backend event stream */}
+        <div className="status">
+          <span>Left: {gestures.Left ?? '–'}</span>
+          <span>Right: {gestures.Right ?? '–'}</span>
+          {scrollMode && <span className="scroll-mode">Scroll Mode Active</span>}
+          {lastAction && <span>Last action: {lastAction}</span>}
+        </div>
+
+        {speech && <div className="speech-caption">Speech: {speech}</div>}
+
         {/* Floating Captions Explaining Gestures */}
         <div className="captions">
           {gestureText}
         </div>
       </div>
 
-      <p className="speech-command">Say 'Hey Adam' to activate speech recognition</p>
+      <p className={listening ? 'speech-command listening' : 'speech-command'}>
+        {listening ? 'Listening…' : "Say 'Hey Adam' to activate speech recognition"}
+      </p>
     </div>
   );
 }